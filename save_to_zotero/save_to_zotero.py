@@ -3,21 +3,22 @@ Script to save webpages as PDFs and add them to Zotero.
 Uses playwright for PDF generation and pyzotero for Zotero integration.
 """
 
-import json
 import os
+import re
 import tempfile
+import threading
 import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Tuple, Union
-import requests
+from typing import Dict, List, Optional, Tuple, Union
 import shutil
-from pyzotero import zotero
-from playwright.sync_api import sync_playwright
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit
 from loguru import logger
 from requests.exceptions import RequestException
 from .utils.misc import (
+    get_connector_session,
     find_available_port,
     configure_logger,
     ensure_zotero_running,
@@ -25,15 +26,69 @@ from .utils.misc import (
 from .utils.webpage import (
     save_webpage_as_pdf,
     get_webpage_metadata,
+    BrowserPool,
     SimpleHTTPServerThread,
+    route_title_only,
 )
 
-# Configure module logger
-configure_logger(__name__)
-
 DEFAULT_CONNECTOR_HOST = "http://127.0.0.1"
 DEFAULT_CONNECTOR_PORT = 23119
 
+# Timeouts in seconds of the saveSnapshot requests: connecting to the local
+# connector is immediate when Zotero is up, saving can take a long time
+CONNECTOR_TIMEOUT = (2, 600)
+
+# Characters removed from titles to build file names
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w ._-]+")
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """
+    Tell whether a failed Zotero API request is worth retrying.
+
+    Args:
+        error: The exception raised by pyzotero
+
+    Returns:
+        True for connection errors, timeouts and server errors, False for
+        errors that would fail again such as a bad key or missing permissions
+    """
+    from pyzotero import zotero_errors
+
+    # Statuses without a dedicated exception, the 5xx ones included
+    if type(error) is zotero_errors.HTTPError:
+        return True
+    # Connection errors and timeouts come from requests or httpx, depending
+    # on the version of pyzotero
+    return isinstance(error, (RequestException, ConnectionError, TimeoutError)) or any(
+        cls.__name__ == "TransportError" for cls in type(error).__mro__
+    )
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that equivalent spellings compare equal.
+
+    The scheme and host are lowercased, the fragment and trailing slashes
+    of the path are dropped.
+
+    Args:
+        url: The URL to normalize
+
+    Returns:
+        The normalized URL
+    """
+    parts = urlsplit(url)
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            "",
+        )
+    )
+
 
 class SaveToZotero:
     """
@@ -42,6 +97,11 @@ class SaveToZotero:
 
     VERSION: str = "1.2.1"
 
+    # Keys of the collections already found by name, per library, so that
+    # the items of a batch do not each search for the same collection
+    _collection_keys: Dict[Tuple[str, str, str], str] = {}
+    _collection_keys_lock = threading.Lock()
+
     def __init__(
         self,
         url: str = None,
@@ -57,6 +117,10 @@ class SaveToZotero:
         tags: str = "save_to_zotero",
         verbose: bool = False,
         keep_going: bool = False,
+        humanize: bool = False,
+        screen_media: bool = True,
+        block_trackers: bool = True,
+        high_dpi: bool = False,
         *arg,
     ):
         """
@@ -65,7 +129,7 @@ class SaveToZotero:
         Args:
             url: str of url to save. If missing, will infer if *arg is a url or path
             pdf: str or path of pdf to save. If missing, will infer if *arg is a url or path
-            wait: Time to wait (ms) for the page to fully load (for URLs)
+            wait: Maximum time to wait (ms) for the page to fully load (for URLs)
             api_key: Zotero API key (defaults to ZOTERO_API_KEY environment variable if not provided)
             library_id: Zotero library ID (defaults to ZOTERO_LIBRARY_ID environment variable if not provided)
             library_type: Zotero library type (must be "user" or "group", defaults to ZOTERO_LIBRARY_TYPE if set)
@@ -76,9 +140,19 @@ class SaveToZotero:
             tags: Comma-separated list of tags to add to the item (defaults to "save_to_zotero")
             verbose: Enable verbose logging
             keep_going: Continue execution even if HTTP requests fail with unexpected status codes
+            humanize: Add small human-like delays while rendering the webpage (slower)
+            screen_media: Render the PDF with the screen stylesheet, as the page looks in a browser. If False the page's print stylesheet is used
+            block_trackers: Abort requests to common ad and analytics domains while rendering the webpage
+            high_dpi: Render the webpage at a device scale factor of 1.5 so that it uses higher resolution images (slower)
             *arg: If present, url and path must not be set: either the url to the webpage or the path to the pdf file.
 
         """
+        # Configure logging
+        configure_logger(
+            log_level="DEBUG" if verbose else "INFO",
+            console=True,
+        )
+
         assert pdf or url or arg, "You must supply either `pdf` or `url` or a unique positional argument"
         assert sum((bool(pdf), bool(url), bool(arg))) == 1, "You can only specify either `pdf` or `url` or a positional argument"
         if arg:
@@ -135,6 +209,10 @@ class SaveToZotero:
         self.tags = tags.split(",") if tags else []
         self.verbose = verbose
         self.keep_going = keep_going
+        self.humanize = humanize
+        self.screen_media = screen_media
+        self.block_trackers = block_trackers
+        self.high_dpi = high_dpi
         self._http_error = None  # Will store error details if keep_going is True
 
         # Extract domain from URL for file naming or use filename for PDF
@@ -151,12 +229,6 @@ class SaveToZotero:
             if len(self.domain) > 30:
                 self.domain = self.domain[:30]
 
-        # Configure logging
-        configure_logger(
-            log_level="DEBUG" if verbose else "INFO",
-            console=True,
-        )
-
         if verbose:
             logger.debug("Verbose logging enabled")
 
@@ -165,6 +237,9 @@ class SaveToZotero:
         logger.info(
             f"Connecting to Zotero library: {self.library_id} ({self.library_type})"
         )
+        # pyzotero is slow to import, it is only loaded once an item is saved
+        from pyzotero import zotero
+
         self.zot = zotero.Zotero(
             library_id,
             library_type,
@@ -186,32 +261,37 @@ class SaveToZotero:
             del attachment_item["data"]["url"]
             attachment_item["data"]["filename"] = self.pdf_path.name
             update_resp = self.zot.update_item(attachment_item)
-            logger.debug(f"Update item response: {update_resp}")
+            logger.debug("Update item response: {}", update_resp)
 
             attachment_key = attachment_item["data"]["key"]
 
             print(f"✓ Item for PDF created with key: {attachment_key}")
 
+            # Fetched once for both the tags and the collection
+            if self.tags or self.collection_name:
+                item = self.zot.item(attachment_key)
+
             # Add tags if specified
             if self.tags:
-                self.add_tags_to_item(attachment_key)
+                self.add_tags_to_item(attachment_key, item=item)
 
             # Add to collection if specified by name
             if self.collection_name:
-                self.add_to_collection(attachment_key)
+                self.add_to_collection(attachment_key, item=item)
 
             print("✓ PDF attachment added successfully")
         elif self.url:
             logger.info(f"Saving {self.url} to Zotero...")
 
+            # The PDF is rendered first so that its title can be given to
+            # the snapshot, instead of loading the page a second time for it
+            logger.info("Creating the PDF attachment")
+            attachment_item, metadata = self.save_pdf_using_snapshot()
+
             logger.info("Saving url using the connector API")
-            webpage_key = self.save_url_using_snapshot()
+            webpage_key = self.save_url_using_snapshot(title=metadata["title"])
             logger.info(f"Snapshot was created with key: {webpage_key}")
 
-            # Now also save the PDF as an attachment to this snapshot
-            logger.info("Now let's create a PDF attachment for snapshot")
-            attachment_item, metadata = self.save_pdf_using_snapshot()
-
             # update the meta field of the webpage to contain metadata
             logger.info("Updating metadata of webpage")
             time.sleep(1)
@@ -252,7 +332,7 @@ class SaveToZotero:
                 ] += f"\noriginal_webpage_title: '{webpage_title}'"
 
             metadata_update = self.zot.update_item(webpage)
-            logger.debug(f"Metadata update answer: {metadata_update}")
+            logger.debug("Metadata update answer: {}", metadata_update)
 
             assert metadata_update, (
                 "Error when updating metadata of webpage "
@@ -267,13 +347,20 @@ class SaveToZotero:
             attachment_item["data"]["parentItem"] = webpage_key
             attachment_item["data"]["filename"] = metadata["title"] + ".pdf"
             update_resp = self.zot.update_item(attachment_item)
-            logger.debug(f"Update item response: {update_resp}")
+            logger.debug("Update item response: {}", update_resp)
 
             # now that we updated and moved the attachment we can delete
-            # the now empty item with url localhost
-            logger.info("Waiting 10s for attachment update to be processed...")
-            time.sleep(10)
+            # the now empty item with url localhost, as soon as the update
+            # shows up as processed instead of after a fixed wait
             empty = self.zot.item(self.find_item_by_url(local_url, itemType="webpage"))
+            delay = 0.5
+            while empty["meta"]["numChildren"] and delay <= 8:
+                logger.info(
+                    f"Waiting {delay}s for attachment update to be processed..."
+                )
+                time.sleep(delay)
+                delay *= 2
+                empty = self.zot.item(empty["key"])
             if empty["meta"]["numChildren"] == 0:
                 self.zot.delete_item(empty)
 
@@ -283,17 +370,82 @@ class SaveToZotero:
             logger.info("Waiting 10s before adding tags and collection...")
             time.sleep(10)
 
+            # Fetched once for both the tags and the collection
+            if self.tags or self.collection_name:
+                item = self.zot.item(webpage_key)
+
             if self.tags:
-                self.add_tags_to_item(webpage_key)
+                self.add_tags_to_item(webpage_key, item=item)
 
             # Add to collection if specified by name
             if self.collection_name:
-                self.add_to_collection(webpage_key)
+                self.add_to_collection(webpage_key, item=item)
         else:
             raise Exception()
 
         print("Item has been saved to your Zotero library.")
-        logger.info("Successfully added to Zotero!")
+
+    @classmethod
+    def batch(
+        cls, items: List[str], max_workers: int = 4, **kwargs
+    ) -> List[Optional["SaveToZotero"]]:
+        """
+        Save several webpages or pdf files to Zotero at the same time.
+
+        Saving an item is mostly waiting on the page and on Zotero, so items
+        are saved by several worker threads. Each worker reuses its own
+        browser for all its items, as Playwright's sync API cannot share a
+        browser between threads.
+
+        Args:
+            items: The urls of the webpages or paths to the pdf files to save
+            max_workers: Number of items saved at the same time
+            **kwargs: Other arguments of SaveToZotero, used for every item
+
+        Returns:
+            The SaveToZotero instance of each item, in the same order as items,
+            or None for the items that could not be saved
+        """
+        max_workers = max(1, min(max_workers, len(items)))
+
+        # Configured once here, the workers then find it already configured
+        # instead of replacing the handlers while the others log
+        configure_logger(
+            log_level="DEBUG" if kwargs.get("verbose") else "INFO",
+            console=True,
+        )
+
+        def save(item: str) -> "SaveToZotero":
+            if Path(item).exists():
+                return cls(pdf=item, **kwargs)
+            return cls(url=item, **kwargs)
+
+        def shutdown_browser(barrier: threading.Barrier) -> None:
+            # Every worker waits for the others, so that each of them runs
+            # exactly one of these and closes its own browser
+            try:
+                barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                pass
+            BrowserPool.instance().shutdown()
+
+        logger.info(f"Saving {len(items)} items to Zotero using {max_workers} workers")
+        results: List[Optional["SaveToZotero"]] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(save, item) for item in items]
+            for item, future in zip(items, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Could not save {item} to Zotero: {str(e)}")
+                    results.append(None)
+
+            # Playwright's objects can only be closed from their own thread
+            barrier = threading.Barrier(max_workers)
+            for _ in range(max_workers):
+                executor.submit(shutdown_browser, barrier)
+
+        return results
 
     def find_collection_by_name(self, name: str) -> Optional[str]:
         """
@@ -305,9 +457,16 @@ class SaveToZotero:
         Returns:
             The collection key if found, None otherwise
         """
+        cache_key = (self.library_type, self.library_id, name)
+        with self._collection_keys_lock:
+            if cache_key in self._collection_keys:
+                return self._collection_keys[cache_key]
+
         try:
             logger.info(f"Searching for collection with name: {name}")
-            collections = self.zot.collections()
+            # Let the server filter on the name instead of downloading every
+            # collection, the exact match is still checked below
+            collections = self.zot.collections(q=name)
 
             for collection in collections:
                 if "data" in collection and "name" in collection["data"]:
@@ -316,6 +475,8 @@ class SaveToZotero:
                         logger.info(
                             f"Found collection '{name}' with key: {collection_key}"
                         )
+                        with self._collection_keys_lock:
+                            self._collection_keys[cache_key] = collection_key
                         return collection_key
 
             logger.warning(f"Could not find collection with name: {name}")
@@ -324,12 +485,34 @@ class SaveToZotero:
             logger.error(f"Error finding collection by name: {e}")
             return None
 
-    def add_tags_to_item(self, item_key: str) -> bool:
+    def _set_item_version(self, item: Dict) -> bool:
+        """
+        Set the version of an item to the one it got when it was just updated.
+
+        pyzotero's write methods only return True, the new version is read
+        from the headers of the last response it received.
+
+        Args:
+            item: The item that was updated by the last request
+
+        Returns:
+            True if the new version was found in the response
+        """
+        response = getattr(self.zot, "request", None)
+        version = getattr(response, "headers", {}).get("Last-Modified-Version")
+        if not version:
+            return False
+        item["version"] = item["data"]["version"] = int(version)
+        return True
+
+    def add_tags_to_item(self, item_key: str, item: Optional[Dict] = None) -> bool:
         """
         Add tags to an item.
 
         Args:
             item_key: The key of the item to add tags to
+            item: The item if already fetched. It is updated in place, version
+                included, so that it can be passed on to another change
 
         Returns:
             True if successful, False otherwise
@@ -342,7 +525,8 @@ class SaveToZotero:
             logger.info(f"Adding tags {self.tags} to item {item_key}")
 
             # Get the current item
-            item = self.zot.item(item_key)
+            if not item:
+                item = self.zot.item(item_key)
 
             # Update the item's tags
             if "data" in item and "tags" in item["data"]:
@@ -358,8 +542,11 @@ class SaveToZotero:
 
                 # Update the item in Zotero
                 result = self.zot.update_item(item)
-                logger.debug(f"Tag addition response: {result}")
-                logger.info(f"Successfully added tags: {', '.join(self.tags)}")
+                logger.debug("Tag addition response: {}", result)
+                if not self._set_item_version(item):
+                    # Make the next change fetch the item again
+                    item.clear()
+                logger.debug("Successfully added tags: {}", self.tags)
                 print(f"✓ Added tags: {', '.join(self.tags)}")
                 return True
             else:
@@ -370,12 +557,14 @@ class SaveToZotero:
             logger.error(f"Error adding tags: {e}")
             return False
 
-    def add_to_collection(self, item_key: str) -> bool:
+    def add_to_collection(self, item_key: str, item: Optional[Dict] = None) -> bool:
         """
         Add an item to the specified collection.
 
         Args:
             item_key: The key of the item to add to the collection
+            item: The item if already fetched. It is updated in place, version
+                included, so that it can be passed on to another change
 
         Returns:
             True if successful, False otherwise
@@ -400,15 +589,20 @@ class SaveToZotero:
             logger.info(f"Adding item {item_key} to collection {collection_key}")
 
             # Get the current item
-            item = self.zot.item(item_key)
+            if not item:
+                item = self.zot.item(item_key)
 
             # Update the item's collections
             if "data" in item and "collections" in item["data"]:
                 # Make sure we're not adding a duplicate
                 if collection_key not in item["data"]["collections"]:
+                    # Only sends the new list of collections instead of the
+                    # whole item
+                    result = self.zot.addto_collection(collection_key, item)
                     item["data"]["collections"].append(collection_key)
-                    # Update the item in Zotero
-                    result = self.zot.update_item(item)
+                    if not self._set_item_version(item):
+                        # Make the next change fetch the item again
+                        item.clear()
                 else:
                     logger.info(f"Item already in collection {collection_key}")
                     return True
@@ -416,16 +610,18 @@ class SaveToZotero:
                 logger.error("Invalid item data structure returned from Zotero API")
                 return False
 
-            logger.debug(f"Collection addition response: {result}")
+            logger.debug("Collection addition response: {}", result)
 
             # Print appropriate message based on which collection identifier was used
             if self.collection_name and self.collection_name != collection_key:
-                logger.info(
-                    f"Successfully added to collection: {self.collection_name} ({collection_key})"
+                logger.debug(
+                    "Successfully added to collection: {} ({})",
+                    self.collection_name,
+                    collection_key,
                 )
                 print(f"✓ Added to collection: {self.collection_name}")
             else:
-                logger.info(f"Successfully added to collection: {collection_key}")
+                logger.debug("Successfully added to collection: {}", collection_key)
                 print(f"✓ Added to collection: {collection_key}")
 
             return True
@@ -433,13 +629,17 @@ class SaveToZotero:
             logger.error(f"Error adding to collection: {e}")
             return False
 
-    def save_url_using_snapshot(self) -> Optional[str]:
+    def save_url_using_snapshot(self, title: Optional[str] = None) -> Optional[str]:
         """
         Save a URL using Zotero connector's saveSnapshot API.
 
         This method communicates directly with the running Zotero instance
         via its connector API to save a webpage as a snapshot.
 
+        Args:
+            title: Title of the page if already known, otherwise the page is
+                loaded to get it
+
         Returns:
             The parent item key if successful, None otherwise
         """
@@ -453,21 +653,26 @@ class SaveToZotero:
         )
 
         # Prepare the payload
-        payload = {"url": self.url, "title": None}  # Will be auto-detected by Zotero
+        payload = {"url": self.url, "title": title}  # Auto-detected by Zotero if None
 
-        try:
-            # Get the title using Playwright for better accuracy
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
+        if not title:
+            try:
+                # Get the title using Playwright for better accuracy
+                # Reuse the browser shared with the PDF generation
+                browser = BrowserPool.instance().get_browser(headless=True)
                 page = browser.new_page()
                 try:
+                    # Only the document and its scripts are needed for the title
+                    page.route("**/*", route_title_only)
                     logger.info(f"Fetching page title for {self.url}")
                     try:
                         # First try with domcontentloaded which is more reliable
                         page.goto(self.url, wait_until="domcontentloaded", timeout=30000)
-                        # Add a small delay to allow more content to load
-                        page.wait_for_timeout(2000)
-                        
+                        # Only give scripts time to set the title if the
+                        # document did not already have one
+                        if not page.title():
+                            page.wait_for_timeout(min(self.wait, 2000))
+
                         # Check if we need more time for dynamic content
                         if not page.title():
                             logger.info("Initial page load completed, waiting for more content...")
@@ -483,7 +688,7 @@ class SaveToZotero:
                         logger.info("Trying fallback loading strategy...")
                         page.goto(self.url, wait_until="load", timeout=30000)
                         page.wait_for_timeout(2000)
-                    
+                
                     title = page.title()
                     if title:
                         payload["title"] = title
@@ -494,7 +699,7 @@ class SaveToZotero:
                     metadata = get_webpage_metadata(page, self.url)
                     if "title" in metadata and metadata["title"]:
                         payload["title"] = metadata["title"]
-                    
+                
                     # Make sure we have some content before proceeding
                     body_content = page.content()
                     if len(body_content) < 100:
@@ -506,17 +711,21 @@ class SaveToZotero:
                             payload["title"] = metadata["title"]
 
                 finally:
-                    browser.close()
-        except Exception as e:
-            logger.warning(f"Error getting page title with Playwright: {e}")
-            # Continue without title, Zotero will attempt to detect it
+                    # Also closes the page's own context, but not the browser
+                    page.close()
+            except Exception as e:
+                logger.warning(f"Error getting page title with Playwright: {e}")
+                # Continue without title, Zotero will attempt to detect it
 
         logger.info(f"Using saveSnapshot to save {self.url}")
-        logger.debug(f"Snapshot payload: {payload}")
+        logger.debug("Snapshot payload: {}", payload)
 
+        since = self._library_version()
         try:
             # Make the request to the Zotero connector
-            response = requests.post(connector_url, json=payload, timeout=600)
+            response = get_connector_session().post(
+                connector_url, json=payload, timeout=CONNECTOR_TIMEOUT
+            )
 
             if response.status_code not in [200, 201]:
                 error_msg = f"Server Error: {response.status_code} ({response.reason})"
@@ -535,12 +744,15 @@ class SaveToZotero:
             logger.info(
                 f"Done saving snapshot (status code: {response.status_code})"
             )
-            logger.debug(f"Snapshot response: {response.text}")
+            # Only decoded when debug logging is enabled
+            logger.opt(lazy=True).debug("Snapshot response: {}", lambda: response.text)
 
             # When saving the snapshot the response
             # doesn't include the item key, so we need to find it
             # by searching for recently added items with this URL
-            snapshot_data = self.find_item_by_url(self.url, itemType="webpage")
+            snapshot_data = self.find_item_by_url(
+                self.url, itemType="webpage", since=since
+            )
 
             return snapshot_data
 
@@ -563,31 +775,41 @@ class SaveToZotero:
             The attachment item data if successful
         """
         # Use a temporary directory to store the PDF before attaching
-        pdf_dir = Path(self.storage_dir) / "SaveToZotero"
+        pdf_dir = self.storage_dir / "SaveToZotero"
         pdf_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create a temporary filename
-        temp_filename = f"{self.domain}_{int(time.time())}.pdf"
-        pdf_path = pdf_dir / temp_filename
+        # The PDF is written once under a predictable name that is served as is,
+        # to avoid issues like space in filenames that might break the url. The
+        # filename Zotero should use is only passed along in the payload.
+        pdf_path = pdf_dir / "during_transfer.pdf"
 
         metadata = None
         if self.url:
             # Save the webpage as PDF
-            metadata = save_webpage_as_pdf(self.url, str(pdf_path), self.wait, self.verbose)
-            # Rename with better title
+            metadata = save_webpage_as_pdf(
+                self.url,
+                str(pdf_path),
+                self.wait,
+                self.verbose,
+                humanize=self.humanize,
+                screen_media=self.screen_media,
+                block_trackers=self.block_trackers,
+                high_dpi=self.high_dpi,
+            )
+            # Name the attachment with a better title
             title = metadata["title"]
-            sanitized_title = "".join(
-                c for c in title if c.isalnum() or c in " ._-"
-            ).strip()
+            sanitized_title = UNSAFE_FILENAME_CHARS.sub("", title).strip()
             sanitized_title = sanitized_title[:50]  # Limit length
-            new_filename = f"{sanitized_title}_{self.domain}.pdf"
-            new_pdf_path = pdf_dir / new_filename
-            pdf_path.rename(new_pdf_path)
+            filename = f"{sanitized_title}_{self.domain}.pdf"
         else:
             title = self.pdf_path.stem
-            new_pdf_path = pdf_dir / self.pdf_path.name
-            new_pdf_path.unlink(missing_ok=True)
-            shutil.copy2(str(self.pdf_path), str(pdf_dir / self.pdf_path.name))
+            filename = self.pdf_path.name
+            try:
+                # A hard link avoids copying the whole file when the temporary
+                # directory is on the same filesystem
+                os.link(self.pdf_path, pdf_path)
+            except OSError:
+                shutil.copy2(str(self.pdf_path), str(pdf_path))
 
         # Attach the PDF to the webpage item
         logger.info("Attaching PDF to the webpage item")
@@ -599,13 +821,7 @@ class SaveToZotero:
         server.start()
 
         try:
-            # copy the pdf to a new file with predictable name to
-            # avoid issues like space in filenames that might
-            # break the url
-            shutil.copy2(
-                str(new_pdf_path), str(new_pdf_path.parent / "during_transfer.pdf")
-            )
-            local_url = f"http://localhost:{server_port}/during_transfer.pdf"
+            local_url = f"http://localhost:{server_port}/{pdf_path.name}"
             logger.info(f"Serving PDF at: {local_url}")
 
             # asking the connector api to save the pdf
@@ -615,87 +831,150 @@ class SaveToZotero:
             payload = {
                 "url": local_url,
                 "title": title,
-                "filename": new_pdf_path.name,
+                "filename": filename,
                 "contentType": "application/pdf",
                 "itemType": "attachment",
             }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
-                connector_url, headers=headers, data=json.dumps(payload)
+            since = self._library_version()
+            response = get_connector_session().post(
+                connector_url,
+                json=payload,
+                timeout=CONNECTOR_TIMEOUT,
+            )
+            # Only decoded when debug logging is enabled
+            logger.opt(lazy=True).debug(
+                "saveSnapshot response: {}", lambda: response.text
             )
-            logger.debug(f"saveSnapshot response: {response.text}")
 
         finally:
             # Stop the HTTP server
             logger.info("Stopping local HTTP server")
             server.stop()
-            (new_pdf_path.parent / "during_transfer.pdf").unlink()
+            # Zotero has its own copy of the PDF by now, free the temporary
+            # directory right away instead of when this instance is collected
+            self.temp_dir.cleanup()
 
         # Get the attachment item of that new pdf
-        attachment_key = self.find_item_by_url(local_url, itemType="attachment")
+        attachment_key = self.find_item_by_url(
+            local_url, itemType="attachment", since=since
+        )
         attachment_item = self.zot.item(attachment_key)
 
         return attachment_item, metadata
 
+    def _library_version(self) -> Optional[int]:
+        """
+        Get the current version of the Zotero library.
+
+        Returns:
+            The last modified version of the library, None if it could not
+            be fetched
+        """
+        try:
+            return self.zot.last_modified_version()
+        except Exception as e:
+            logger.warning(f"Could not get the library version: {str(e)}")
+            return None
+
     def find_item_by_url(
         self,
         url: str,
-        max_attempts: int = 3,
-        delay: float = 30.0,
+        max_attempts: int = 10,
+        delay: Optional[float] = None,
         itemType: str = "webpage",
+        *,
+        initial_delay: float = 0.5,
+        max_delay: float = 30.0,
+        since: Optional[int] = None,
     ) -> Optional[str]:
         """
         Find a recently added Zotero item by its URL.
 
+        The first attempt is made right away, the delay between attempts then
+        doubles from initial_delay up to max_delay. With the defaults this
+        waits about two minutes in total before giving up.
+
         Args:
             url: The URL to search for
             max_attempts: Maximum number of attempts to find the item
-            delay: Delay between attempts in seconds
+            delay: Deprecated alias of initial_delay
             itemType: The type of item to search for (e.g., 'webpage' or 'attachment')
+            initial_delay: Delay in seconds before the second attempt
+            max_delay: Maximum delay between attempts in seconds
+            since: Library version from before the item was saved, to only
+                search the items modified after it
 
         Returns:
             The item key if found, None otherwise
         """
-        logger.info(f"Waiting {delay}s for the snapshot to be created...")
-        time.sleep(delay)
+        if delay is not None:
+            warnings.warn(
+                "find_item_by_url's delay argument is deprecated, use initial_delay",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            initial_delay = delay
+
+        from pyzotero import zotero_errors
+
+        # Raised by pyzotero when a rate limited request ran out of retries,
+        # it was renamed in recent versions
+        too_many_retries = getattr(
+            zotero_errors, "TooManyRetriesError", None
+        ) or getattr(zotero_errors, "TooManyRetries")
 
         # Sometimes it takes a moment for the item to appear in the Zotero database
+        wanted_url = _normalize_url(url)
+        delay = initial_delay
         for attempt in range(max_attempts):
+            if attempt > 0:
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
             try:
-                # Get recent items, sorted by date added (newest first)
-                items = self.zot.items(sort="dateAdded", direction="desc", limit=10)
-                # sort so that oldest items are first and latest are last
-                items = sorted(
-                    items,
-                    key=lambda x: datetime.fromisoformat(
-                        x["data"]["dateModified"].replace("Z", "+00:00")
-                    ),
-                )
-                items = [item for item in items if "data" in item]
-                items = [item for item in items if "url" in item["data"]]
-                items = [item for item in items if item["data"]["url"] == url]
-                # keep only the webpage instead of the attachment etc
+                # Get recent items, sorted by date added (newest first), only
+                # of the wanted type (the webpage instead of the attachment etc)
+                # so that the server does not send the others
+                query = {"sort": "dateAdded", "direction": "desc", "limit": 10}
                 if itemType:
-                    items = [
-                        item for item in items if item["data"]["itemType"] == itemType
-                    ]
+                    query["itemType"] = itemType
+                if since is not None:
+                    query["since"] = since
+                items = [
+                    item
+                    for item in self.zot.items(**query)
+                    if _normalize_url(item.get("data", {}).get("url") or "") == wanted_url
+                ]
 
                 # If we didn't find it, wait and try again
                 if not items:
                     logger.info(
                         f"Item not found, waiting {delay} seconds and retrying..."
                     )
-                    time.sleep(delay)
                     continue
 
-                logger.debug(f"Items corresponding to URL {url}:")
-                for item in items:
-                    logger.debug(item)
+                # Only stringified when debug logging is enabled
+                logger.opt(lazy=True).debug(
+                    "Items corresponding to URL {}:\n{}",
+                    lambda: url,
+                    lambda: "\n".join(str(item) for item in items),
+                )
 
-                return items[-1]["data"]["key"]
+                # Keep the latest modified one, Zotero's ISO 8601 UTC dates
+                # compare correctly as strings. max returns the first of equal
+                # dates, reversed keeps the last one like sorting used to
+                latest = max(reversed(items), key=lambda x: x["data"]["dateModified"])
+                return latest["data"]["key"]
 
+            except too_many_retries as e:
+                # pyzotero already waited out the Backoff and Retry-After
+                # headers, polling more would only prolong the rate limiting
+                logger.error(f"Rate limited by the Zotero API, giving up: {e}")
+                break
             except Exception as e:
                 logger.error(f"Error searching for item by URL: {e}")
+                if _is_transient_error(e):
+                    # Try again after the delay
+                    continue
                 break
 
         logger.warning(
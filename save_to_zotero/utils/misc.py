@@ -5,11 +5,14 @@ Utility functions for common operations.
 from typing import Optional
 import sys
 import requests
-from pathlib import Path
 from loguru import logger
 import platformdirs
 import os
 import pdb
+import gzip
+import shutil
+import socket
+import threading
 
 if bool(os.environ.get("SAVE_TO_ZOTERO_DEBUG", False)):
     def excepthook(type, value, tb):
@@ -24,10 +27,30 @@ APP_NAME = "save_to_zotero"
 APP_AUTHOR = "save_to_zotero"
 
 # Default log file location - platform-appropriate user directory
-DEFAULT_LOG_FILE = str(
-    Path(platformdirs.user_log_dir(APP_NAME, APP_AUTHOR)) / "save_to_zotero.log"
+DEFAULT_LOG_FILE = os.path.join(
+    platformdirs.user_log_dir(APP_NAME, APP_AUTHOR), "save_to_zotero.log"
 )
 
+# Log line format, shared by the console and the log file
+LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} - {name} - {level} - {message}"
+
+# Arguments of the last configure_logger call, to skip reconfiguring the
+# handlers when nothing changed
+_configured_signature = None
+_configure_lock = threading.Lock()
+
+
+def _compress_log(path: str) -> None:
+    """
+    Compress a rotated log file with gzip at its fastest level.
+
+    Args:
+        path: Path of the rotated log file, removed once compressed
+    """
+    with open(path, "rb") as src, gzip.open(path + ".gz", "wb", compresslevel=1) as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+
 
 def configure_logger(
     logger_name: Optional[str] = None,
@@ -38,6 +61,10 @@ def configure_logger(
     """
     Configure loguru logger with consistent formatting.
 
+    Nothing is configured at import time. SaveToZotero calls this once it
+    knows the log level; code using the utilities on their own should call
+    it from its entry point.
+
     Args:
         logger_name: Name of the logger (ignored in loguru, kept for compatibility)
         log_level: Logging level (default: "INFO")
@@ -47,6 +74,27 @@ def configure_logger(
     Returns:
         Configured loguru logger
     """
+    global _configured_signature
+    signature = (log_level, log_file, console)
+    with _configure_lock:
+        if signature == _configured_signature:
+            return logger
+        _configure_handlers(log_level, log_file, console)
+        _configured_signature = signature
+    return logger
+
+
+def _configure_handlers(
+    log_level: str, log_file: Optional[str], console: bool
+) -> None:
+    """
+    Replace the loguru handlers, see configure_logger.
+
+    Args:
+        log_level: Logging level
+        log_file: Path to log file (optional)
+        console: Whether to log to console
+    """
     # Remove any existing handlers
     logger.remove()
 
@@ -54,33 +102,50 @@ def configure_logger(
     if console:
         logger.add(
             sys.stdout,
-            format="{time:YYYY-MM-DD HH:mm:ss} - {name} - {level} - {message}",
+            format=LOG_FORMAT,
             level=log_level,
         )
 
     # Add file handler if specified
     if log_file:
         # Ensure directory exists
-        log_path = Path(log_file)
-        log_dir = log_path.parent
-        if str(log_dir) != "" and not log_dir.exists():
-            log_dir.mkdir(parents=True, exist_ok=True)
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
 
         logger.add(
             log_file,
-            format="{time:YYYY-MM-DD HH:mm:ss} - {name} - {level} - {message}",
+            format=LOG_FORMAT,
             level=log_level,
             rotation="10 MB",
-            compression="zip",
+            compression=_compress_log,
         )
 
-        logger.debug(f"Log file location: {Path(log_file).absolute()}")
+        logger.debug(f"Log file location: {os.path.abspath(log_file)}")
 
-    return logger
+
+# Sessions used for the requests to the Zotero connector, so that its local
+# connection is kept alive instead of reopened for each call. requests does
+# not guarantee that a Session is thread-safe, so each thread gets its own.
+_connector_sessions = threading.local()
+
+
+def get_connector_session() -> requests.Session:
+    """
+    Get the current thread's session for the Zotero connector requests.
+
+    Returns:
+        The session, created on first use in each thread
+    """
+    session = getattr(_connector_sessions, "session", None)
+    if session is None:
+        session = _connector_sessions.session = requests.Session()
+    return session
 
 
-# Configure module logger
-configure_logger()
+# Connectors already found running, so that the items of a batch do not each
+# ping the same one
+_running_connectors = set()
 
 
 def ensure_zotero_running(
@@ -89,6 +154,8 @@ def ensure_zotero_running(
     """
     Check if Zotero is running and raise an exception if not.
 
+    A connector found running is not pinged again by later calls.
+
     Args:
         connector_host: Zotero connector host address
         connector_port: Zotero connector port number
@@ -99,13 +166,18 @@ def ensure_zotero_running(
     Raises:
         RuntimeError: If Zotero is not running
     """
+    connector = (connector_host, connector_port)
+    if connector in _running_connectors:
+        return True
+
     try:
         # Try to contact the Zotero connector API
-        response = requests.post(
+        response = get_connector_session().post(
             f"{connector_host}:{connector_port}/connector/ping", timeout=2
         )
         if response.status_code == 200:
             logger.info("Zotero is already running")
+            _running_connectors.add(connector)
             return True
     except requests.exceptions.RequestException:
         error_msg = (
@@ -119,16 +191,24 @@ def ensure_zotero_running(
 
 def find_available_port(start_port: int = 25852, max_attempts: int = 100) -> int:
     """
-    Find an available port starting from the given port number.
+    Find an available port, at or above the given port number.
+
+    The OS is first asked for a free ephemeral port, ports are only scanned
+    one by one from start_port if that one is below it.
 
     Args:
-        start_port: Port number to start checking from
-        max_attempts: Maximum number of ports to check
+        start_port: Lowest acceptable port number, where the scan starts
+        max_attempts: Maximum number of ports to check when scanning
 
     Returns:
         An available port number
     """
-    import socket
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("localhost", 0))
+        port = s.getsockname()[1]
+    if port >= start_port:
+        logger.debug(f"Found available port: {port}")
+        return port
 
     logger.debug(f"Searching for available port starting from {start_port}")
     for port in range(start_port, start_port + max_attempts):
@@ -138,7 +218,6 @@ def find_available_port(start_port: int = 25852, max_attempts: int = 100) -> int
                 logger.debug(f"Found available port: {port}")
                 return port
         except OSError:
-            logger.debug(f"Port {port} is not available")
             continue
 
     error_msg = f"Could not find an available port after {max_attempts} attempts"
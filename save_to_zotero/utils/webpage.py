@@ -3,48 +3,579 @@ Utility functions for web page processing and operations.
 """
 
 import os
+import atexit
+import functools
 import threading
 import http.server
-import socketserver
 import random
+import re
 import time
 from datetime import datetime
-from typing import Dict, Any
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright, Page
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from urllib.parse import unquote, urlparse
+import requests
+from loguru import logger
 
-from .misc import configure_logger
+if TYPE_CHECKING:
+    # Playwright is slow to import, it is only loaded once a browser is needed
+    from playwright.sync_api import Browser, Page, Playwright
 
-# Configure module logger
-logger = configure_logger(__name__)
+# Common desktop user agents, one is picked at random when the
+# ZOTERO_USER_AGENT environment variable is not set
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+USER_AGENTS = (
+    DEFAULT_USER_AGENT,
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
+)
 
+# Browser context settings shared by every page rendered
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 900},  # Standard readable size
+    "java_script_enabled": True,
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+}
 
-def save_webpage_as_pdf(url: str, output_path: str, wait_for_load: int = 5000, verbose: bool = False) -> dict:
+# Ads and analytics requests, aborted when rendering pages as they only
+# delay the load event and never add to the content. Only the requests
+# matching this are routed through Python.
+TRACKER_URL_PATTERN = re.compile(
+    r"^https?://([^/?#]+\.)?("
+    r"googletagmanager\.com|google-analytics\.com|googlesyndication\.com|"
+    r"googleadservices\.com|doubleclick\.net|adservice\.google\.com|"
+    r"connect\.facebook\.net|hotjar\.com|segment\.(io|com)|mixpanel\.com|"
+    r"amplitude\.com|scorecardresearch\.com|quantserve\.com|taboola\.com|"
+    r"outbrain\.com|criteo\.(com|net)|adnxs\.com|amazon-adsystem\.com|"
+    r"chartbeat\.(com|net)|newrelic\.com|nr-data\.net|clarity\.ms"
+    r")[/:?#]|^https?://cdn\.ampproject\.org/.*amp-ad"
+)
+
+# Resource types not needed to read the title and meta tags of a page
+TITLE_ONLY_BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+
+# Chromium flags of the shared browsers. The sandbox is left enabled.
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    # /dev/shm is often too small in containers, which makes pages crash
+    "--disable-dev-shm-usage",
+]
+
+
+# Returns the title and the description, author and publication date meta
+# tags of a page
+PAGE_META_SCRIPT = """() => {
+    const getContent = (selectors) => {
+        for (const selector of selectors) {
+            const meta = document.querySelector(selector);
+            if (meta) {
+                return meta.getAttribute('content') || '';
+            }
+        }
+        return '';
+    };
+    return {
+        title: document.title,
+        description: getContent(['meta[name="description"]', 'meta[property="og:description"]']),
+        author: getContent(['meta[name="author"]', 'meta[property="article:author"]']),
+        publicationDate: getContent(['meta[name="publication_date"]', 'meta[property="article:published_time"]']),
+    };
+}"""
+
+# Content expansion helpers, installed once per browser context with
+# add_init_script so that each page only has to send a short call to them
+EXPAND_HIDDEN_ELEMENTS_INIT_SCRIPT = (
+    "window.__saveToZoteroGetMeta = " + PAGE_META_SCRIPT + ";\n"
+    + """
+window.__saveToZoteroExpandHidden = async (currentUrl) => {
+    // Meta tags are read up front and returned with the expansion result
+    // so that they do not need a round-trip of their own
+    const meta = window.__saveToZoteroGetMeta();
+
+    // Resolve once the DOM has not changed for quietMs, or after maxMs at
+    // the latest, instead of always waiting the full duration
+    const waitForQuiet = (maxMs, quietMs = 100) => new Promise(resolve => {
+        let quietTimer = null;
+        let maxTimer = null;
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(done, quietMs);
+        });
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(maxTimer);
+            resolve();
+        };
+        observer.observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+        quietTimer = setTimeout(done, Math.min(quietMs, maxMs));
+        maxTimer = setTimeout(done, maxMs);
+    });
+
+    // First pass: Basic content expansion with minimal risk of navigation
+    // Returns the number of elements it made visible
+    const showHiddenContent = () => {
+        const accessibilitySelector = [
+            '[aria-hidden="true"]',
+            '[aria-expanded="false"]',
+            '.sr-only', '.screen-reader-text', '.visually-hidden',
+            '[hidden]',
+            '[role="tabpanel"]'
+        ].join(', ');
+        // Class-only groups are kept as sets of class names so that matched
+        // elements can be classified from their classList without
+        // re-running selector matching
+        const truncatedClasses = new Set(['truncated', 'clamp', 'line-clamp']);
+        const contentClasses = new Set([
+            'collapse', 'accordion-content', 'dropdown-menu',
+            'hidden-content', 'expandable-content',
+            'read-more-content', 'show-more-content'
+        ]);
+        const toSelector = (classes) => Array.from(classes, c => '.' + c).join(', ');
+        const hasClassIn = (el, classes) => {
+            for (const c of el.classList) {
+                if (classes.has(c)) {
+                    return true;
+                }
+            }
+            return false;
+        };
+        
+        // Gather every kind of hidden content in one DOM traversal, then
+        // dispatch on what each element matched
+        const hiddenSelector = [
+            'details', accessibilitySelector,
+            toSelector(truncatedClasses), toSelector(contentClasses)
+        ].join(', ');
+        
+        let shown = 0;
+        document.querySelectorAll(hiddenSelector).forEach(el => {
+            shown++;
+            
+            // 1. Open all details elements
+            if (el.tagName === 'DETAILS') {
+                el.setAttribute('open', 'true');
+                el.open = true;
+                el.style.display = 'block';
+                
+                // Make all children of details visible
+                Array.from(el.children).forEach(child => {
+                    if (child.tagName !== 'SUMMARY') {
+                        child.style.display = 'block';
+                        child.style.visibility = 'visible';
+                    }
+                });
+            }
+            
+            // 2. Make hidden accessible content visible
+            if (el.matches(accessibilitySelector)) {
+                // Basic show operation
+                if (el.getAttribute('aria-hidden') === 'true') {
+                    el.setAttribute('aria-hidden', 'false');
+                }
+                if (el.getAttribute('aria-expanded') === 'false') {
+                    el.setAttribute('aria-expanded', 'true');
+                }
+                if (el.hasAttribute('hidden')) {
+                    el.removeAttribute('hidden');
+                }
+                
+                // Apply visibility styles
+                el.style.display = 'block';
+                el.style.visibility = 'visible';
+                el.style.height = 'auto';
+                el.style.maxHeight = 'none';
+                el.style.overflow = 'visible';
+            }
+            
+            // 3. Expand truncated text
+            if (hasClassIn(el, truncatedClasses)) {
+                el.style.maxHeight = 'none';
+                el.style.webkitLineClamp = 'unset';
+                el.style.display = 'block';
+                el.style.overflow = 'visible';
+            }
+            
+            // 4. Show elements commonly used to hide content
+            if (hasClassIn(el, contentClasses)) {
+                el.style.display = 'block';
+                el.style.visibility = 'visible';
+                el.style.height = 'auto';
+                el.style.opacity = '1';
+                el.classList.add('show');
+                el.classList.add('active');
+                el.classList.remove('hidden');
+                el.classList.remove('collapsed');
+            }
+        });
+        
+        return shown;
+    };
+
+    // Second pass: Remove popups and overlays
+    const removeOverlays = () => {
+        // Common overlay and popup selectors
+        const overlaySelectors = [
+            '.modal-backdrop', '.overlay', '.popup-overlay',
+            '.cookie-banner', '.cookie-consent', '.gdpr-banner',
+            '.subscription-popup', '.newsletter-popup', '.paywall'
+        ];
+        
+        document.querySelectorAll(overlaySelectors.join(', ')).forEach(el => {
+            try {
+                el.remove();
+            } catch(e) {
+                el.style.display = 'none';
+            }
+        });
+        
+        // Fix body scroll if it was locked
+        document.body.style.overflow = 'auto';
+        document.documentElement.style.overflow = 'auto';
+    };
+
+    // Helper to check if element would cause navigation, memoized per element
+    // as the same elements are checked by several selectors
+    const navigatingElements = new WeakSet();
+    const nonNavigatingElements = new WeakSet();
+    const wouldNavigate = (el) => {
+        if (navigatingElements.has(el)) {
+            return true;
+        }
+        if (nonNavigatingElements.has(el)) {
+            return false;
+        }
+        let navigates = false;
+        if (el.tagName === 'A') {
+            const href = el.getAttribute('href');
+            if (href && 
+                href !== '#' && 
+                !href.startsWith('#') && 
+                !href.startsWith('javascript:')) {
+                navigates = true;
+            }
+        }
+        (navigates ? navigatingElements : nonNavigatingElements).add(el);
+        return navigates;
+    };
+
+    // Third pass: Safely interact with elements that expand content,
+    // returns the number of elements clicked
+    const safelyExpandInteractive = () => {
+        let clicks = 0;
+        
+        // Find and click "read more"/"show more" buttons that won't navigate
+        // (streamed from the live collection rather than materializing a
+        // static NodeList of every candidate before filtering it)
+        // Case-insensitive so the text doesn't need to be lowercased first
+        const expanderTextPattern = /more|expand/i;
+        const allElements = document.body.getElementsByTagName('*');
+        const expandButtons = [];
+        for (let i = 0; i < allElements.length; i++) {
+            const el = allElements[i];
+            const tag = el.tagName;
+            if (tag !== 'BUTTON' && tag !== 'A' && tag !== 'SPAN' && tag !== 'DIV') {
+                continue;
+            }
+            const text = el.textContent;
+            if (!text) {
+                continue;
+            }
+            if (expanderTextPattern.test(text) && !wouldNavigate(el)) {
+                expandButtons.push(el);
+            }
+        }
+        
+        // Cancel the default action of any link reached by our clicks so that
+        // they cannot navigate, page handlers still run normally
+        const preventLinkNavigation = (ev) => {
+            if (ev.target instanceof Element && ev.target.closest('a')) {
+                ev.preventDefault();
+            }
+        };
+        document.addEventListener('click', preventLinkNavigation, true);
+        
+        expandButtons.forEach(el => {
+            try {
+                el.click();
+                clicks++;
+            } catch (e) {
+                // Ignore click errors
+            }
+        });
+        
+        // Expand common UI patterns
+        const expandableSelectors = [
+            'details:not([open])',
+            '.accordion:not(.active)',
+            '[aria-expanded="false"]',
+            '.faq-question:not(.active)'
+        ];
+        
+        document.querySelectorAll(expandableSelectors.join(', ')).forEach(el => {
+            if (!wouldNavigate(el)) {
+                try {
+                    el.click();
+                    clicks++;
+                } catch(e) {
+                    // If clicking fails, try direct attribute manipulation
+                    if (el.tagName === 'DETAILS') {
+                        el.setAttribute('open', 'true');
+                        el.open = true;
+                    } else if (el.getAttribute('aria-expanded') === 'false') {
+                        el.setAttribute('aria-expanded', 'true');
+                    }
+                    el.classList.add('active');
+                    el.classList.add('show');
+                }
+            }
+        });
+        
+        document.removeEventListener('click', preventLinkNavigation, true);
+        
+        return clicks;
+    };
+
+    // Final pass to ensure maximum content visibility
+    const finalExpansion = () => {
+        const finalSelector = [
+            '[style*="height"]', '[style*="max-height"]',
+            '[style*="display: none"]', '[style*="visibility: hidden"]',
+            'details'
+        ].join(', ');
+        
+        // Read phase: measure everything before touching any style so
+        // that layout is only flushed once instead of once per element
+        const candidates = Array.from(document.querySelectorAll(finalSelector)).map(el => {
+            // Read the inline style once instead of re-matching selectors
+            const style = el.getAttribute('style') || '';
+            return {
+                el,
+                height: el.clientHeight,
+                textLen: el.textContent.trim().length,
+                isSized: style.indexOf('height') >= 0,
+                isHidden: style.indexOf('display: none') >= 0 ||
+                          style.indexOf('visibility: hidden') >= 0,
+            };
+        });
+        
+        // Elements containing a paragraph or heading, collected on first use
+        // by walking up from each of those rather than searching the subtree
+        // of every hidden candidate
+        let contentAncestors = null;
+        const hasContentDescendant = (el) => {
+            if (contentAncestors === null) {
+                contentAncestors = new WeakSet();
+                document.querySelectorAll('p, h1, h2, h3, h4, h5, h6').forEach(node => {
+                    for (let a = node.parentElement; a && !contentAncestors.has(a); a = a.parentElement) {
+                        contentAncestors.add(a);
+                    }
+                });
+            }
+            return contentAncestors.has(el);
+        };
+        
+        // Write phase
+        candidates.forEach(({el, height, textLen, isSized, isHidden}) => {
+            // 1. Ensure all content heights are adequate
+            // (skip truly huge elements to avoid breaking layout)
+            if (isSized && height < 1000 && textLen > 10) {
+                el.style.height = 'auto';
+                el.style.maxHeight = 'none';
+            }
+            
+            // 2. Final check for display:none elements with content
+            if (isHidden && (textLen > 20 || hasContentDescendant(el))) {
+                el.style.display = 'block';
+                el.style.visibility = 'visible';
+            }
+            
+            // 3. Final pass for details elements
+            if (el.tagName === 'DETAILS') {
+                el.setAttribute('open', 'true');
+                el.open = true;
+                el.style.display = 'block';
+            }
+        });
+    };
+
+    // Second run to catch any elements modified by the first one, skipped
+    // along with its waits when the first one found nothing to show
+    if (showHiddenContent() > 0) {
+        await waitForQuiet(300);
+        showHiddenContent();
+        await waitForQuiet(100);
+    }
+
+    removeOverlays();
+    await waitForQuiet(300);
+
+    // Block anything the clicks below could use to leave the page, so we
+    // never have to reload it (and lose the expansion) afterwards
+    const originalOpen = window.open;
+    const originalPushState = history.pushState;
+    const originalReplaceState = history.replaceState;
+    const blockUnload = (e) => { e.preventDefault(); e.returnValue = ''; return ''; };
+    window.open = () => null;
+    history.pushState = function(state, title) { return originalPushState.call(this, state, title); };
+    history.replaceState = function(state, title) { return originalReplaceState.call(this, state, title); };
+    window.addEventListener('beforeunload', blockUnload, true);
+
+    try {
+        // Only wait for expanded content to render if something was clicked
+        if (safelyExpandInteractive() > 0) {
+            await waitForQuiet(500);
+        }
+
+        finalExpansion();
+        await waitForQuiet(500);
+    } finally {
+        window.open = originalOpen;
+        history.pushState = originalPushState;
+        history.replaceState = originalReplaceState;
+        window.removeEventListener('beforeunload', blockUnload, true);
+    }
+
+    return {meta};
+};
+"""
+)
+
+
+class BrowserPool:
+    """
+    Playwright browsers shared by every page opened in the current thread.
+
+    Starting Playwright and launching Chromium is the slowest part of
+    rendering a page, so both are done lazily once and then reused; callers
+    only create (and close) their own contexts or pages. Playwright's sync
+    API objects cannot be shared between threads, so each thread gets its
+    own pool. Everything is shut down when the interpreter exits.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self._playwright = None
+        self._browsers: Dict[bool, "Browser"] = {}
+
+    @classmethod
+    def instance(cls) -> "BrowserPool":
+        """Get the current thread's pool, creating it on first use"""
+        pool = getattr(cls._local, "pool", None)
+        if pool is None:
+            pool = cls._local.pool = cls()
+            atexit.register(pool.shutdown)
+        return pool
+
+    @property
+    def playwright(self) -> "Playwright":
+        """The running Playwright instance, started on first use"""
+        if self._playwright is None:
+            logger.debug("Starting Playwright")
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+        return self._playwright
+
+    def get_browser(self, headless: bool = True) -> "Browser":
+        """
+        Get a running Chromium browser, launching it on first use.
+
+        Args:
+            headless: Whether the browser should be headless
+
+        Returns:
+            The shared browser for this headless mode
+        """
+        browser = self._browsers.get(headless)
+        if browser is None or not browser.is_connected():
+            logger.debug(f"Launching browser (headless: {headless})")
+            browser = self.playwright.chromium.launch(
+                headless=headless,
+                args=BROWSER_ARGS,
+            )
+            self._browsers[headless] = browser
+        return browser
+
+    def shutdown(self) -> None:
+        """Close all the browsers and stop Playwright"""
+        for browser in self._browsers.values():
+            try:
+                browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {str(e)}")
+        self._browsers.clear()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Playwright: {str(e)}")
+            self._playwright = None
+
+
+def route_title_only(route) -> None:
+    """
+    Route handler aborting the requests that are not needed to read the
+    title and meta tags of a page: images, stylesheets, fonts, media and
+    trackers.
+
+    Args:
+        route: The Playwright route of the request
+    """
+    request = route.request
+    if (
+        request.resource_type in TITLE_ONLY_BLOCKED_RESOURCE_TYPES
+        or TRACKER_URL_PATTERN.search(request.url)
+    ):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def save_webpage_as_pdf(
+    url: str,
+    output_path: str,
+    wait_for_load: int = 5000,
+    verbose: bool = False,
+    humanize: bool = False,
+    screen_media: bool = True,
+    high_dpi: bool = False,
+    block_trackers: bool = True,
+) -> dict:
     """
     Save a webpage as a PDF using Playwright with human-like behavior.
 
     Args:
         url: The URL of the webpage to save
         output_path: The path where the PDF will be saved
-        wait_for_load: Base time to wait in ms for page to fully load (will be randomized)
+        wait_for_load: Maximum time to wait in ms for the network to settle after the page loaded
         verbose: Whether to run in verbose mode (also sets headless to False)
+        humanize: Whether to add small human-like delays before navigating,
+            reading the title and printing (slower, off by default)
+        screen_media: Whether to render the PDF with the screen stylesheet, as
+            the page looks in a browser. If False the page's print stylesheet is
+            used, which saves a round-trip to the browser
+        high_dpi: Whether to render with a device scale factor of 1.5 instead
+            of 1, so that pages serve higher resolution images (slower, text is
+            vector in the PDF either way)
+        block_trackers: Whether to abort requests to common ad and analytics
+            domains, which makes pages load faster
 
     Returns:
         The metadata of the page
     """
-    # Default user agent that will be used if environment variable is not set
-    DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
-
-    # Common desktop user agents for random selection
-    user_agents = [
-        DEFAULT_USER_AGENT,
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
-    ]
-
     # Get user agent from environment variable or choose randomly
-    user_agent = os.environ.get("ZOTERO_USER_AGENT", random.choice(user_agents))
+    user_agent = os.environ.get("ZOTERO_USER_AGENT") or random.choice(USER_AGENTS)
+
+    # A url that already points to a PDF is saved as is, without a browser
+    metadata = download_pdf(url, output_path, user_agent)
+    if metadata:
+        return metadata
     
     # Determine headless mode from environment variable (default to True) or verbose flag
     # If verbose is True, set headless_mode to False to see the browser UI
@@ -52,464 +583,484 @@ def save_webpage_as_pdf(url: str, output_path: str, wait_for_load: int = 5000, v
     headless_mode = env_headless and not verbose
     logger.info(f"Browser headless mode: {headless_mode}")
 
-    viewport = {"width": 1280, "height": 900}  # Standard readable size
-    device_scale_factor = 1.5  # Good balance for text clarity
-    java_script_enabled = True
-    locale = "en-US"
-    timezone_id = "America/New_York"
+    # Text is vector in the PDF, a higher scale only changes the images picked
+    # by the page, at a much higher rendering cost
+    device_scale_factor = 1.5 if high_dpi else 1.0
 
-    with sync_playwright() as p:
-        # Configure browser with custom user agent and other options
-        launch_args = {
-            "args": ["--disable-blink-features=AutomationControlled"]
-        }
+    pool = BrowserPool.instance()
+
+    # Check if user data directory is specified in environment variable
+    user_data_dir = os.environ.get("ZOTERO_BROWSER_USER_DATA_DIR")
+    
+    if user_data_dir:
+        logger.info(f"Using browser user data directory: {user_data_dir}")
+        logger.info(f"Running browser with user data directory (headless: {headless_mode})")
         
-        # Check if user data directory is specified in environment variable
-        user_data_dir = os.environ.get("ZOTERO_BROWSER_USER_DATA_DIR")
+        # Use launch_persistent_context for user data directories
+        context = pool.playwright.chromium.launch_persistent_context(
+            user_data_dir=user_data_dir,
+            headless=headless_mode,
+            args=["--disable-blink-features=AutomationControlled"],
+            user_agent=user_agent,
+            device_scale_factor=device_scale_factor,
+            **CONTEXT_OPTIONS,
+        )
+    else:
+        # Reuse the shared browser, only the context is specific to this page
+        browser = pool.get_browser(headless=headless_mode)
         
-        if user_data_dir:
-            logger.info(f"Using browser user data directory: {user_data_dir}")
-            logger.info(f"Running browser with user data directory (headless: {headless_mode})")
-            
-            # Use launch_persistent_context for user data directories
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                headless=headless_mode,
-                args=["--disable-blink-features=AutomationControlled"],
-                user_agent=user_agent,
-                viewport=viewport,
-                device_scale_factor=device_scale_factor,
-                java_script_enabled=java_script_enabled,
-                locale=locale,
-                timezone_id=timezone_id,
-            )
-            browser = None  # No separate browser instance in this case
-        else:
-            # Set headless mode based on environment variable
-            launch_args["headless"] = headless_mode
-            browser = p.chromium.launch(**launch_args)
-            
-            # Create context with optimal reading settings for all devices
-            context = browser.new_context(
-                user_agent=user_agent,
-                viewport=viewport,
-                device_scale_factor=device_scale_factor,
-                java_script_enabled=java_script_enabled,
-                locale=locale,
-                timezone_id=timezone_id,
-            )
+        # Create context with optimal reading settings for all devices
+        context = browser.new_context(
+            user_agent=user_agent,
+            device_scale_factor=device_scale_factor,
+            **CONTEXT_OPTIONS,
+        )
 
-        # Add humanizing attributes to prevent fingerprinting
-        context.add_init_script(
-            """
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => false
-            });
+    # Add humanizing attributes to prevent fingerprinting, along with the
+    # content expansion helpers, registered as a single init script
+    context.add_init_script(
         """
-        )
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => false
+        });
+    """
+        + EXPAND_HIDDEN_ELEMENTS_INIT_SCRIPT
+    )
 
-        page = context.new_page()
+    if block_trackers:
+        context.route(TRACKER_URL_PATTERN, lambda route: route.abort())
 
-        try:
+    page = context.new_page()
+
+    try:
+        if humanize:
             # Add small random delay before navigation (100-500ms)
             time.sleep(random.randint(100, 500) / 1000)
 
-            logger.info(f"Navigating to {url}")
-            # Try to navigate with a more reliable strategy using fallbacks
-            try:
-                # First try with "load" which is more reliable than "networkidle"
-                logger.info("Attempting navigation with 'load' strategy")
-                page.goto(url, wait_until="load", timeout=30000)
-            except Exception as e:
-                logger.warning(f"Initial navigation attempt failed: {str(e)}")
-                # Fallback to "domcontentloaded" which is less strict
-                logger.info("Falling back to 'domcontentloaded' strategy")
-                page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # After navigation, perform additional stability checks
-            logger.info(f"Basic navigation complete, stabilizing page...")
-            
-            # Wait for the page to stabilize 
-            page.wait_for_timeout(wait_for_load)
-            
-            # Additional check for content loading
-            try:
-                # Wait for common content indicators (heading elements and paragraphs)
-                page.wait_for_selector("h1, h2, p", timeout=5000)
-                logger.info("Content elements detected on page")
-            except Exception as e:
-                logger.warning(f"Could not detect common content elements: {str(e)}")
-                # Continue anyway, as some sites might have unusual structures
+        logger.info(f"Navigating to {url}")
+        # Try to navigate with a more reliable strategy using fallbacks
+        try:
+            # First try with "load" which is more reliable than "networkidle"
+            logger.info("Attempting navigation with 'load' strategy")
+            page.goto(url, wait_until="load", timeout=30000)
+        except Exception as e:
+            logger.warning(f"Initial navigation attempt failed: {str(e)}")
+            # Fallback to "domcontentloaded" which is less strict
+            logger.info("Falling back to 'domcontentloaded' strategy")
+            page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        
+        # After navigation, perform additional stability checks
+        logger.info(f"Basic navigation complete, stabilizing page...")
+        
+        # Wait for the page to stabilize, returning early once the network is quiet
+        _wait_for_network_quiet(page, cap_ms=wait_for_load)
+        
+        # Additional check for content loading
+        try:
+            # Wait for common content indicators (heading elements and paragraphs)
+            page.wait_for_selector("h1, h2, p", timeout=5000)
+            logger.info("Content elements detected on page")
+        except Exception as e:
+            logger.warning(f"Could not detect common content elements: {str(e)}")
+            # Continue anyway, as some sites might have unusual structures
 
+        # Load lazy images directly, only falling back to scrolling through
+        # the page when that is not enough
+        lazy_content = _load_lazy_content(page)
+        if lazy_content and lazy_content["resolved"] and not lazy_content["unresolved"]:
+            logger.info(
+                f"Loaded {lazy_content['resolved']} lazy elements directly, skipping scrolling"
+            )
+        else:
             # Simulate human-like scrolling behavior
             _simulate_scrolling(page)
 
-            # Expand dropdowns, accordions, and other hidden content
-            _expand_hidden_elements(page)
+        # Expand dropdowns, accordions, and other hidden content
+        page_meta = _expand_hidden_elements(page)
 
+        if humanize:
             # Small consistent delay before getting title
             time.sleep(100 / 1000)
 
-            # Extract metadata for later use
-            metadata = get_webpage_metadata(page, url)
+        # Extract metadata for later use
+        metadata = get_webpage_metadata(page, url, page_meta)
 
-            # add more metadata
-            metadata["user_agent"] = user_agent
-            metadata["viewport"] = viewport
-            metadata["device_scale_factor"] = device_scale_factor
-            metadata["java_script_enabled"] = java_script_enabled
-            metadata["locale"] = locale
-            metadata["timezone_id"] = timezone_id
+        # add more metadata
+        metadata["user_agent"] = user_agent
+        metadata["device_scale_factor"] = device_scale_factor
+        metadata.update(CONTEXT_OPTIONS)
 
-            # Get the page title for metadata
-            title = metadata["title"]
-            logger.info(f"Retrieved page title: {title}")
+        # Get the page title for metadata
+        title = metadata["title"]
+        logger.info(f"Retrieved page title: {title}")
 
-            # Configure PDF options for better quality
+        # Configure PDF options for better quality
+        if screen_media:
             page.emulate_media(media="screen")
-            logger.info(f"Generating PDF at {output_path}")
+        logger.info(f"Generating PDF at {output_path}")
 
+        if humanize:
             # Consistent delay before PDF generation
             time.sleep(300 / 1000)
 
-            page.pdf(
-                path=output_path,
-                format="A4",
-                print_background=True,
-                scale=0.9,  # Slightly scaled down to fit more content
-                margin={
-                    "top": "0.4in",
-                    "bottom": "0.4in",
-                    "left": "0.4in",
-                    "right": "0.4in",
-                },
-            )
+        page.pdf(
+            path=output_path,
+            format="A4",
+            print_background=True,
+            scale=0.9,  # Slightly scaled down to fit more content
+            margin={
+                "top": "0.4in",
+                "bottom": "0.4in",
+                "left": "0.4in",
+                "right": "0.4in",
+            },
+        )
+
+        return metadata
+    except Exception as e:
+        logger.error(f"Error saving webpage as PDF: {str(e)}")
+        raise e
+    finally:
+        # The browser itself stays open for the next page
+        context.close()
+
+
+def download_pdf(
+    url: str, output_path: str, user_agent: str = DEFAULT_USER_AGENT
+) -> Optional[Dict[str, Any]]:
+    """
+    Download the url directly if it serves a PDF file.
+
+    Urls whose path ends in .pdf are requested right away. Other urls, like
+    ``https://arxiv.org/pdf/<id>``, are first checked with a HEAD request and
+    only downloaded if their Content-Type is a PDF. Only the response headers
+    are read when the url turns out not to be a PDF, the connection is then
+    dropped before the body is downloaded.
+
+    Args:
+        url: The URL to download
+        output_path: The path where the PDF will be saved
+        user_agent: The user agent sent with the request
+
+    Returns:
+        The metadata of the PDF if it was downloaded, None otherwise
+    """
+    parsed_url = urlparse(url)
+    if not parsed_url.path.lower().endswith(".pdf") and not _serves_pdf(
+        url, user_agent
+    ):
+        return None
+
+    try:
+        # Fail fast on unreachable hosts but leave time for slow downloads
+        with requests.get(
+            url, headers={"User-Agent": user_agent}, stream=True, timeout=(3, 30)
+        ) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if not response.ok or not content_type.startswith("application/pdf"):
+                return None
+
+            logger.info(f"{url} is a PDF file, downloading it directly")
+            with open(output_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+    except Exception as e:
+        logger.warning(f"Could not download {url} directly: {str(e)}")
+        return None
+
+    domain = parsed_url.netloc
+    if domain.startswith("www."):
+        domain = domain[4:]  # Remove www. prefix if present
+    title = unquote(os.path.basename(parsed_url.path.rstrip("/")))
+    if title.lower().endswith(".pdf"):
+        title = title[:-4]
+
+    return {
+        "title": title or domain,
+        "url": url,
+        "accessDate": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "domain": domain,
+    }
+
+
+def _serves_pdf(url: str, user_agent: str = DEFAULT_USER_AGENT) -> bool:
+    """
+    Check with a HEAD request whether the url serves a PDF file.
+
+    Args:
+        url: The URL to check
+        user_agent: The user agent sent with the request
+
+    Returns:
+        True if the final response after redirects has a PDF Content-Type
+    """
+    try:
+        response = requests.head(
+            url,
+            headers={"User-Agent": user_agent},
+            allow_redirects=True,
+            timeout=(3, 10),
+        )
+    except Exception as e:
+        logger.debug(f"HEAD request to {url} failed: {str(e)}")
+        return False
+    content_type = response.headers.get("Content-Type", "")
+    return response.ok and content_type.startswith("application/pdf")
+
+
+def _wait_for_network_quiet(page: "Page", quiet_ms: int = 500, cap_ms: int = 3000) -> None:
+    """
+    Wait until no request has been in flight for a while, with an upper bound.
+
+    Unlike ``wait_until="networkidle"`` this does not stall until the timeout
+    on pages that keep analytics or websocket connections busy.
+
+    Args:
+        page: The Playwright page object
+        quiet_ms: How long in ms the network must stay quiet
+        cap_ms: Maximum time to wait in ms
+    """
+    pending = set()
+    on_request = pending.add
+    on_request_done = pending.discard
+    page.on("request", on_request)
+    page.on("requestfinished", on_request_done)
+    page.on("requestfailed", on_request_done)
+    try:
+        waited = 0
+        quiet = 0
+        while waited < cap_ms and quiet < quiet_ms:
+            page.wait_for_timeout(100)
+            waited += 100
+            quiet = 0 if pending else quiet + 100
+        logger.debug(f"Waited {waited}ms for the network to settle")
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("requestfinished", on_request_done)
+        page.remove_listener("requestfailed", on_request_done)
 
-            context.close()
-            if browser:  # Only close browser if it was created separately
-                browser.close()
-            return metadata
-        except Exception as e:
-            logger.error(f"Error saving webpage as PDF: {str(e)}")
-            context.close()
-            if browser:  # Only close browser if it was created separately
-                browser.close()
-            raise e
+
+def _load_lazy_content(page: "Page") -> Optional[Dict[str, int]]:
+    """
+    Make lazily loaded images and iframes load without scrolling to them.
+
+    Native ``loading="lazy"`` elements are switched to eager loading and the
+    ``data-src``/``data-srcset`` attributes used by common lazy-loading
+    libraries are copied to their real counterparts.
+
+    Args:
+        page: The Playwright page object
+
+    Returns:
+        The number of elements made to load (``resolved``) and of lazy
+        elements that still need to be scrolled into view (``unresolved``),
+        or None if this failed
+    """
+    try:
+        return page.evaluate("""() => {
+            let resolved = 0;
+
+            // A single tree walk for every kind of lazy element, branching on
+            // what each one turns out to be
+            document.querySelectorAll(
+                'img[loading="lazy"], iframe[loading="lazy"], ' +
+                'img[data-src], img[data-lazy-src], img[data-original], iframe[data-src], ' +
+                'img[data-srcset], source[data-srcset]'
+            ).forEach(el => {
+                if (el.loading === 'lazy') {
+                    el.loading = 'eager';
+                    resolved++;
+                }
+
+                if (el.tagName !== 'SOURCE') {
+                    const src = el.dataset.src || el.dataset.lazySrc || el.dataset.original;
+                    if (src && el.getAttribute('src') !== src) {
+                        el.src = src;
+                        resolved++;
+                    }
+                }
+
+                const srcset = el.dataset.srcset;
+                if (srcset && el.tagName !== 'IFRAME' && el.getAttribute('srcset') !== srcset) {
+                    el.srcset = srcset;
+                    resolved++;
+                }
+            });
+
+            // Lazy content that is only loaded once scrolled into view, such
+            // as lazy background images
+            const unresolved = document.querySelectorAll(
+                '.lazy:not(img):not(iframe):not(source), ' +
+                '.lazyload:not(img):not(iframe):not(source), ' +
+                '[data-bg], [data-background-image]'
+            ).length;
+
+            return {resolved, unresolved};
+        }""")
+    except Exception as e:
+        logger.warning(f"Error loading lazy content: {str(e)}")
+        # Scrolling will be used instead
+        return None
 
 
-def _simulate_scrolling(page: Page) -> None:
+def _simulate_scrolling(page: "Page") -> None:
     """
     Simulate human-like scrolling behavior on a webpage.
 
+    The whole scroll sequence runs in the browser in a single
+    ``page.evaluate`` call instead of one round-trip per step.
+
     Args:
         page: The Playwright page object
     """
     try:
-        # Get page height
-        height = page.evaluate("document.body.scrollHeight")
-        viewport_height = page.viewport_size["height"]
-        
-        # Calculate number of scrolls with overlap
-        num_scrolls = max(3, int(height / (viewport_height * 0.8)) + 1)
-        
-        logger.info(f"Scrolling through page with {num_scrolls} steps")
-        
-        for i in range(num_scrolls):
-            # Calculate scroll position with 20% overlap between scrolls
-            scroll_to = min(i * (viewport_height * 0.8), height)
-            
-            # Scroll with smooth behavior
-            page.evaluate(f"window.scrollTo({{top: {scroll_to}, behavior: 'smooth'}})")
-            
-            # Pause to let content load
-            page.wait_for_timeout(600)
-            
-            # Slight jitter in scroll position to trigger lazy-loading
-            if i > 0 and i < num_scrolls - 1:
-                jitter = random.randint(-30, 30)
-                page.evaluate(f"window.scrollBy(0, {jitter})")
-                page.wait_for_timeout(200)
+        num_scrolls = page.evaluate("""async () => {
+            // Wait until neither the DOM changed nor a resource finished loading
+            // for quietMs, for at most maxMs
+            const waitForSettle = (quietMs, maxMs) => new Promise(resolve => {
+                if (maxMs <= 0) return resolve();
+                let quietTimer;
+                const mutationObserver = new MutationObserver(() => bump());
+                const resourceObserver = new PerformanceObserver(() => bump());
+                const finish = () => {
+                    clearTimeout(quietTimer);
+                    clearTimeout(capTimer);
+                    mutationObserver.disconnect();
+                    resourceObserver.disconnect();
+                    resolve();
+                };
+                const bump = () => {
+                    clearTimeout(quietTimer);
+                    quietTimer = setTimeout(finish, quietMs);
+                };
+                const capTimer = setTimeout(finish, maxMs);
+                mutationObserver.observe(document.body, {childList: true, subtree: true, attributes: true});
+                resourceObserver.observe({type: 'resource'});
+                bump();
+            });
+
+            // Wait for a smooth scroll to end, for at most maxMs
+            const waitForScrollEnd = (maxMs) => new Promise(resolve => {
+                const done = () => {
+                    clearTimeout(capTimer);
+                    window.removeEventListener('scrollend', done);
+                    resolve();
+                };
+                const capTimer = setTimeout(done, maxMs);
+                window.addEventListener('scrollend', done);
+            });
+
+            // Get page height
+            const height = document.body.scrollHeight;
+            const viewportHeight = window.innerHeight;
+
+            // Calculate number of scrolls with overlap
+            const numScrolls = Math.max(3, Math.floor(height / (viewportHeight * 0.8)) + 1);
+
+            for (let i = 0; i < numScrolls; i++) {
+                // Calculate scroll position with 20% overlap between scrolls
+                const scrollTo = Math.min(i * (viewportHeight * 0.8), height);
+
+                // Scroll with smooth behavior
+                const deadline = performance.now() + 600;
+                const previousY = window.scrollY;
+                window.scrollTo({top: scrollTo, behavior: 'smooth'});
+
+                // Let the content revealed by the scroll load, without waiting
+                // longer than needed on static pages
+                if (Math.abs(scrollTo - previousY) > 1) {
+                    await waitForScrollEnd(400);
+                }
+                await waitForSettle(150, deadline - performance.now());
+
+                // Slight jitter in scroll position to trigger lazy-loading
+                if (i > 0 && i < numScrolls - 1) {
+                    const jitter = Math.floor(Math.random() * 61) - 30;
+                    window.scrollBy(0, jitter);
+                    await waitForSettle(100, 200);
+                }
+            }
+            return numScrolls;
+        }""")
+        logger.info(f"Scrolled through page with {num_scrolls} steps")
                 
     except Exception as e:
         logger.warning(f"Error during scrolling simulation: {str(e)}")
         # Continue if scrolling fails - this is non-critical
 
 
-def _expand_hidden_elements(page: Page) -> None:
+def _expand_hidden_elements(page: "Page") -> Optional[Dict[str, str]]:
     """
     Expand dropdowns, accordions, and other hidden content to ensure
     all text is visible in the PDF without navigating away from the current page.
 
+    All expansion passes run inside a single ``page.evaluate`` call, the
+    waits between passes happening in the browser, to avoid one round-trip
+    per pass. The page's context must have ``EXPAND_HIDDEN_ELEMENTS_INIT_SCRIPT``
+    installed as an init script.
+
     Args:
         page: The Playwright page object
+
+    Returns:
+        The page's title and meta tags as returned by ``PAGE_META_SCRIPT``, or None
+        if the expansion failed
     """
     try:
         # Store the current URL to check against later
         current_url = page.url
         logger.info(f"Current URL before expansion: {current_url}")
-        
-        # First pass: Basic content expansion with minimal risk of navigation
-        logger.info("Expanding standard content elements")
-        page.evaluate("""() => {
-            // Basic content visibility function
-            const showHiddenContent = () => {
-                // 1. Open all details elements
-                document.querySelectorAll('details').forEach(el => {
-                    el.setAttribute('open', 'true');
-                    el.open = true;
-                    el.style.display = 'block';
-                    
-                    // Make all children of details visible
-                    Array.from(el.children).forEach(child => {
-                        if (child.tagName !== 'SUMMARY') {
-                            child.style.display = 'block';
-                            child.style.visibility = 'visible';
-                        }
-                    });
-                });
-                
-                // 2. Make hidden accessible content visible
-                const accessibilitySelectors = [
-                    '[aria-hidden="true"]',
-                    '[aria-expanded="false"]',
-                    '.sr-only', '.screen-reader-text', '.visually-hidden',
-                    '[hidden]',
-                    '[role="tabpanel"]'
-                ];
-                
-                accessibilitySelectors.forEach(selector => {
-                    document.querySelectorAll(selector).forEach(el => {
-                        // Basic show operation
-                        if (selector === '[aria-hidden="true"]') {
-                            el.setAttribute('aria-hidden', 'false');
-                        } else if (selector === '[aria-expanded="false"]') {
-                            el.setAttribute('aria-expanded', 'true');
-                        } else if (selector === '[hidden]') {
-                            el.removeAttribute('hidden');
-                        }
-                        
-                        // Apply visibility styles
-                        el.style.display = 'block';
-                        el.style.visibility = 'visible';
-                        el.style.height = 'auto';
-                        el.style.maxHeight = 'none';
-                        el.style.overflow = 'visible';
-                    });
-                });
-                
-                // 3. Expand truncated text
-                document.querySelectorAll('.truncated, .clamp, .line-clamp').forEach(el => {
-                    el.style.maxHeight = 'none';
-                    el.style.webkitLineClamp = 'unset';
-                    el.style.display = 'block';
-                    el.style.overflow = 'visible';
-                });
-                
-                // 4. Show elements commonly used to hide content
-                const contentSelectors = [
-                    '.collapse', '.accordion-content', '.dropdown-menu',
-                    '.hidden-content', '.expandable-content',
-                    '.read-more-content', '.show-more-content'
-                ];
-                
-                contentSelectors.forEach(selector => {
-                    document.querySelectorAll(selector).forEach(el => {
-                        el.style.display = 'block';
-                        el.style.visibility = 'visible';
-                        el.style.height = 'auto';
-                        el.style.opacity = '1';
-                        el.classList.add('show');
-                        el.classList.add('active');
-                        el.classList.remove('hidden');
-                        el.classList.remove('collapsed');
-                    });
-                });
-            };
-            
-            // Run content expansion
-            showHiddenContent();
-            // Second pass to catch any elements modified by the first pass
-            setTimeout(showHiddenContent, 300);
-        }""")
-        
-        # Allow time for the first expansion pass
-        page.wait_for_timeout(400)
-        
-        # Second pass: Remove overlays and distractions
-        logger.info("Removing overlays and popups")
-        page.evaluate("""() => {
-            // Remove popups and overlays
-            const removeOverlays = () => {
-                // Common overlay and popup selectors
-                const overlaySelectors = [
-                    '.modal-backdrop', '.overlay', '.popup-overlay',
-                    '.cookie-banner', '.cookie-consent', '.gdpr-banner',
-                    '.subscription-popup', '.newsletter-popup', '.paywall'
-                ];
-                
-                overlaySelectors.forEach(selector => {
-                    document.querySelectorAll(selector).forEach(el => {
-                        try {
-                            el.remove();
-                        } catch(e) {
-                            el.style.display = 'none';
-                        }
-                    });
-                });
-                
-                // Fix body scroll if it was locked
-                document.body.style.overflow = 'auto';
-                document.documentElement.style.overflow = 'auto';
-            };
-            
-            removeOverlays();
-        }""")
-        
-        # Allow time for overlay removal
-        page.wait_for_timeout(300)
-        
-        # Third pass: Safe interaction with content expanders
-        logger.info("Expanding interactive elements")
-        page.evaluate("""(currentUrl) => {
-            // Safely interact with elements that expand content
-            const safelyExpandInteractive = () => {
-                // Helper to check if element would cause navigation
-                const wouldNavigate = (el) => {
-                    if (el.tagName === 'A') {
-                        const href = el.getAttribute('href');
-                        if (href && 
-                            href !== '#' && 
-                            !href.startsWith('#') && 
-                            !href.startsWith('javascript:')) {
-                            return true;
-                        }
-                    }
-                    return false;
-                };
-                
-                // Find and click "read more"/"show more" buttons that won't navigate
-                const expandButtons = Array.from(document.querySelectorAll('button, a, span, div'))
-                    .filter(el => {
-                        const text = (el.textContent || '').toLowerCase();
-                        return (text.includes('more') || text.includes('expand')) && 
-                               !wouldNavigate(el);
-                    });
-                
-                expandButtons.forEach(el => {
-                    try {
-                        const beforeUrl = window.location.href;
-                        el.click();
-                        
-                        // Revert if navigation occurred
-                        if (window.location.href !== beforeUrl) {
-                            history.pushState(null, '', beforeUrl);
-                        }
-                    } catch (e) {
-                        // Ignore click errors
-                    }
-                });
-                
-                // Expand common UI patterns
-                const expandableSelectors = [
-                    'details:not([open])',
-                    '.accordion:not(.active)',
-                    '[aria-expanded="false"]',
-                    '.faq-question:not(.active)'
-                ];
-                
-                expandableSelectors.forEach(selector => {
-                    document.querySelectorAll(selector).forEach(el => {
-                        if (!wouldNavigate(el)) {
-                            try {
-                                el.click();
-                            } catch(e) {
-                                // If clicking fails, try direct attribute manipulation
-                                if (selector === 'details:not([open])') {
-                                    el.setAttribute('open', 'true');
-                                    el.open = true;
-                                } else if (selector === '[aria-expanded="false"]') {
-                                    el.setAttribute('aria-expanded', 'true');
-                                }
-                                el.classList.add('active');
-                                el.classList.add('show');
-                            }
-                        }
-                    });
-                });
-            };
-            
-            safelyExpandInteractive();
-        }""", current_url)
-        
-        # Allow time for interactive elements
-        page.wait_for_timeout(500)
-        
-        # Final check and expansion for any remaining hidden content
-        logger.info("Final content expansion pass")
-        page.evaluate("""() => {
-            // Final pass to ensure maximum content visibility
-            const finalExpansion = () => {
-                // 1. Ensure all content heights are adequate
-                document.querySelectorAll('[style*="height"], [style*="max-height"]').forEach(el => {
-                    // Skip truly huge elements to avoid breaking layout
-                    if (el.clientHeight < 1000 && el.textContent.trim().length > 10) {
-                        el.style.height = 'auto';
-                        el.style.maxHeight = 'none';
-                    }
-                });
-                
-                // 2. Final check for display:none elements with content
-                document.querySelectorAll('[style*="display: none"], [style*="visibility: hidden"]').forEach(el => {
-                    // Only make visible if it contains actual content
-                    if (el.textContent.trim().length > 20 || 
-                        el.querySelectorAll('p, h1, h2, h3, h4, h5, h6').length > 0) {
-                        el.style.display = 'block';
-                        el.style.visibility = 'visible';
-                    }
-                });
-                
-                // 3. Final pass for details elements
-                document.querySelectorAll('details').forEach(el => {
-                    el.setAttribute('open', 'true');
-                    el.open = true;
-                    el.style.display = 'block';
-                });
-            };
-            
-            finalExpansion();
-        }""")
-        
-        # Allow final expansions to take effect
-        page.wait_for_timeout(500)
-        
-        # Check if URL changed and restore if needed
+
+        logger.info("Expanding hidden content, removing overlays and expanding interactive elements")
+        result = page.evaluate(
+            "(currentUrl) => window.__saveToZoteroExpandHidden(currentUrl)",
+            current_url,
+        )
+
+        # Navigation is blocked in the browser during expansion; this reload
+        # is only a last resort for pages that get around those guards
         if page.url != current_url:
             logger.warning(f"URL changed to {page.url}, navigating back to original")
-            page.goto(current_url, wait_until="networkidle", timeout=30000)
-            page.wait_for_timeout(500)
+            page.goto(current_url, wait_until="load", timeout=30000)
+            _wait_for_network_quiet(page)
+            # The meta tags collected belong to the page we navigated away from
+            result["meta"] = None
         
         logger.info("Completed content expansion successfully")
+        return result["meta"]
         
     except Exception as e:
         logger.warning(f"Error while expanding hidden elements: {str(e)}")
         # Continue if expansion fails - this is non-critical
+        return None
 
 
-def get_webpage_metadata(page: Page, url: str) -> Dict[str, Any]:
+def get_webpage_metadata(
+    page: "Page", url: str, page_meta: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     Extract metadata from a webpage.
 
     Args:
         page: The Playwright page object
         url: The URL of the webpage
+        page_meta: Title and meta tags already read from the page with
+            ``PAGE_META_SCRIPT`` (optional, read from the page if missing)
 
     Returns:
         Dictionary containing webpage metadata
     """
-    # Consistent delay before metadata extraction
-    time.sleep(100 / 1000)
+    # Get the title, description, author and publication date in one
+    # round-trip unless they were already collected during content expansion
+    if page_meta is None:
+        try:
+            page_meta = page.evaluate(PAGE_META_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Error extracting additional metadata: {str(e)}")
+            page_meta = {}
+
     metadata = {
-        "title": page.title(),
+        "title": page_meta["title"] if "title" in page_meta else page.title(),
         "url": url,
         "accessDate": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
@@ -521,42 +1072,10 @@ def get_webpage_metadata(page: Page, url: str) -> Dict[str, Any]:
         domain = domain[4:]  # Remove www. prefix if present
     metadata["domain"] = domain
 
-    # Try to extract additional metadata
-    try:
-        # Extract description or abstract if available
-        description = page.evaluate(
-            """() => {
-            const meta = document.querySelector('meta[name="description"]') || 
-                         document.querySelector('meta[property="og:description"]');
-            return meta ? meta.getAttribute('content') : '';
-        }"""
-        )
-        if description:
-            metadata["description"] = description
-
-        # Extract author if available
-        author = page.evaluate(
-            """() => {
-            const meta = document.querySelector('meta[name="author"]') || 
-                         document.querySelector('meta[property="article:author"]');
-            return meta ? meta.getAttribute('content') : '';
-        }"""
-        )
-        if author:
-            metadata["author"] = author
-
-        # Extract publication date if available
-        pub_date = page.evaluate(
-            """() => {
-            const meta = document.querySelector('meta[name="publication_date"]') || 
-                         document.querySelector('meta[property="article:published_time"]');
-            return meta ? meta.getAttribute('content') : '';
-        }"""
-        )
-        if pub_date:
-            metadata["publicationDate"] = pub_date
-    except Exception as e:
-        logger.warning(f"Error extracting additional metadata: {str(e)}")
+    # Add the additional metadata that the page provides
+    for key, value in page_meta.items():
+        if key != "title" and value:
+            metadata[key] = value
 
     return metadata
 
@@ -575,9 +1094,13 @@ class SimpleHTTPServerThread(threading.Thread):
 
     def run(self):
         """Run the HTTP server in this thread"""
-        os.chdir(self.directory)
-        handler = http.server.SimpleHTTPRequestHandler
-        self.httpd = socketserver.TCPServer(("localhost", self.port), handler)
+        # Serve from the directory without changing the process-wide cwd
+        handler = functools.partial(
+            http.server.SimpleHTTPRequestHandler, directory=str(self.directory)
+        )
+        # Threaded so that concurrent (e.g. range) requests are not serialized,
+        # it also sets SO_REUSEADDR and uses daemon threads
+        self.httpd = http.server.ThreadingHTTPServer(("localhost", self.port), handler)
         self._started.set()
         self.httpd.serve_forever()
 
@@ -0,0 +1,209 @@
+"""
+Tests of SaveToZotero's Zotero API handling, with the client stubbed out.
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from save_to_zotero import save_to_zotero as module
+from save_to_zotero.save_to_zotero import SaveToZotero
+
+
+class FakeZotero:
+    """Minimal stand-in for pyzotero's client, writes return True like it does."""
+
+    def __init__(self):
+        self.version = 1
+        self.request = None
+        self.fetches = 0
+        self.writes = []
+
+    def item(self, key):
+        self.fetches += 1
+        return {
+            "key": key,
+            "version": self.version,
+            "data": {
+                "key": key,
+                "version": self.version,
+                "tags": [],
+                "collections": [],
+            },
+        }
+
+    def _write(self, name, item):
+        assert item["version"] == self.version, "outdated version sent"
+        self.writes.append(name)
+        self.version += 1
+        self.request = SimpleNamespace(
+            headers={"Last-Modified-Version": str(self.version)}
+        )
+        return True
+
+    def update_item(self, item):
+        return self._write("update_item", item)
+
+    def addto_collection(self, collection, item):
+        return self._write("addto_collection", item)
+
+
+def _saver(**attributes):
+    """SaveToZotero instance with a fake client, without running __init__."""
+    saver = object.__new__(SaveToZotero)
+    saver.zot = FakeZotero()
+    saver.tags = []
+    saver.collection = None
+    saver.collection_name = None
+    for name, value in attributes.items():
+        setattr(saver, name, value)
+    return saver
+
+
+def test_item_version_follows_writes():
+    saver = _saver(tags=["a", "b"], collection="COLL")
+    item = saver.zot.item("KEY")
+
+    assert saver.add_tags_to_item("KEY", item=item)
+    assert saver.add_to_collection("KEY", item=item)
+
+    assert saver.zot.fetches == 1
+    assert saver.zot.writes == ["update_item", "addto_collection"]
+    assert item["version"] == item["data"]["version"] == saver.zot.version
+
+
+def test_item_is_refetched_without_version_header():
+    saver = _saver(tags=["a"], collection="COLL")
+    item = saver.zot.item("KEY")
+    saver.zot.request = None
+    with mock.patch.object(saver, "_set_item_version", return_value=False):
+        assert saver.add_tags_to_item("KEY", item=item)
+    assert item == {}
+
+    assert saver.add_to_collection("KEY", item=item)
+    assert saver.zot.fetches == 2
+
+
+def test_batch_keeps_order_and_closes_each_worker_browser(monkeypatch, tmp_path):
+    pdf_path = tmp_path / "document.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    saved = []
+
+    def fake_init(self, url=None, pdf=None, **kwargs):
+        if url == "https://example.com/fails":
+            raise RuntimeError("could not save")
+        self.saved = pdf or url
+        saved.append(threading.current_thread().name)
+
+    shutdowns = []
+    pool = mock.MagicMock()
+    pool.shutdown.side_effect = lambda: shutdowns.append(
+        threading.current_thread().name
+    )
+    configure_logger = mock.MagicMock()
+    monkeypatch.setattr(SaveToZotero, "__init__", fake_init)
+    monkeypatch.setattr(module.BrowserPool, "instance", lambda: pool)
+    monkeypatch.setattr(module, "configure_logger", configure_logger)
+
+    items = [
+        "https://example.com/a",
+        str(pdf_path),
+        "https://example.com/fails",
+        "https://example.com/b",
+    ]
+    results = SaveToZotero.batch(items, max_workers=3, verbose=True)
+
+    assert [r.saved if r else None for r in results] == [
+        "https://example.com/a",
+        str(pdf_path),
+        None,
+        "https://example.com/b",
+    ]
+    configure_logger.assert_called_once_with(log_level="DEBUG", console=True)
+    # One shutdown per worker thread, each from a different thread
+    assert len(shutdowns) == 3
+    assert len(set(shutdowns)) == 3
+    assert set(saved) <= set(shutdowns)
+
+
+def _failing_saver(monkeypatch, error):
+    """Saver whose item listing always raises error, returns its mock."""
+    monkeypatch.setattr(module.time, "sleep", lambda seconds: None)
+    saver = _saver()
+    saver.zot = mock.MagicMock()
+    saver.zot.items.side_effect = error
+    return saver
+
+
+def test_find_item_by_url_gives_up_on_permanent_errors(monkeypatch):
+    from pyzotero import zotero_errors
+
+    saver = _failing_saver(monkeypatch, zotero_errors.UserNotAuthorisedError("403"))
+    assert saver.find_item_by_url("https://example.com", max_attempts=5) is None
+    assert saver.zot.items.call_count == 1
+
+
+def test_find_item_by_url_retries_transient_errors(monkeypatch):
+    from pyzotero import zotero_errors
+
+    saver = _failing_saver(monkeypatch, zotero_errors.HTTPError("503"))
+    assert saver.find_item_by_url("https://example.com", max_attempts=5) is None
+    assert saver.zot.items.call_count == 5
+
+
+def test_find_item_by_url_keeps_the_old_positional_order(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(module.time, "sleep", sleeps.append)
+    items = [
+        {
+            "data": {
+                "key": key,
+                "url": "https://example.com",
+                "itemType": item_type,
+                "dateModified": "2024-01-01T00:00:00Z",
+            }
+        }
+        for key, item_type in [("WEBPAGE", "webpage"), ("ATTACHMENT", "attachment")]
+    ]
+    responses = iter([[], items])
+    saver = _saver()
+    saver.zot = mock.MagicMock()
+    saver.zot.items.side_effect = lambda **query: [
+        item
+        for item in next(responses)
+        if query.get("itemType", item["data"]["itemType"]) == item["data"]["itemType"]
+    ]
+
+    with mock.patch.object(module.warnings, "warn"):
+        key = saver.find_item_by_url("https://example.com", 2, 3, "attachment")
+
+    assert key == "ATTACHMENT"
+    assert sleeps == [3]
+
+
+def test_find_item_by_url_accepts_deprecated_delay(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(module.time, "sleep", sleeps.append)
+    saver = _saver()
+    saver.zot = mock.MagicMock()
+    saver.zot.items.return_value = []
+
+    with mock.patch.object(module.warnings, "warn") as warn:
+        saver.find_item_by_url("https://example.com", max_attempts=2, delay=3)
+
+    assert warn.call_args.args[1] is DeprecationWarning
+    assert sleeps == [3]
+
+
+def test_find_item_by_url_picks_last_of_equal_dates():
+    saver = _saver()
+    saver.zot = mock.MagicMock()
+    saver.zot.items.return_value = [
+        {"data": {"key": key, "url": "https://example.com", "dateModified": date}}
+        for key, date in [
+            ("OLD", "2024-01-01T00:00:00Z"),
+            ("FIRST", "2024-01-02T00:00:00Z"),
+            ("LAST", "2024-01-02T00:00:00Z"),
+        ]
+    ]
+    assert saver.find_item_by_url("https://example.com") == "LAST"
@@ -0,0 +1,89 @@
+"""
+Smoke tests of the webpage utilities, with the browser stubbed out.
+"""
+
+from unittest import mock
+
+from save_to_zotero.utils import webpage
+
+
+def _stub_pool(monkeypatch, page_title="Example title"):
+    """Make BrowserPool hand out a mocked browser, returns the mocked page."""
+    page = mock.MagicMock()
+    page.evaluate.return_value = {}
+    page.title.return_value = page_title
+
+    browser = mock.MagicMock()
+    browser.new_context.return_value.new_page.return_value = page
+
+    pool = mock.MagicMock()
+    pool.get_browser.return_value = browser
+    monkeypatch.setattr(webpage.BrowserPool, "instance", lambda: pool)
+    monkeypatch.delenv("ZOTERO_BROWSER_USER_DATA_DIR", raising=False)
+    return page
+
+
+def test_save_webpage_as_pdf_with_stubbed_browser(monkeypatch, tmp_path):
+    monkeypatch.setattr(webpage, "download_pdf", lambda *args, **kwargs: None)
+    page = _stub_pool(monkeypatch)
+    output_path = str(tmp_path / "page.pdf")
+
+    metadata = webpage.save_webpage_as_pdf(
+        "https://example.com/article", output_path, wait_for_load=0
+    )
+
+    page.pdf.assert_called_once()
+    assert page.pdf.call_args.kwargs["path"] == output_path
+    assert metadata["title"] == "Example title"
+    assert metadata["url"] == "https://example.com/article"
+    assert metadata["domain"] == "example.com"
+    for key in webpage.CONTEXT_OPTIONS:
+        assert metadata[key] == webpage.CONTEXT_OPTIONS[key]
+
+
+def test_download_pdf_skips_html_urls(monkeypatch, tmp_path):
+    head = mock.MagicMock()
+    head.return_value.ok = True
+    head.return_value.headers = {"Content-Type": "text/html; charset=utf-8"}
+    get = mock.MagicMock()
+    monkeypatch.setattr(webpage.requests, "head", head)
+    monkeypatch.setattr(webpage.requests, "get", get)
+
+    output_path = str(tmp_path / "a.pdf")
+    assert webpage.download_pdf("https://example.com/article", output_path) is None
+    assert head.call_args.kwargs["timeout"] == (3, 10)
+    get.assert_not_called()
+
+
+def test_download_pdf_downloads_pdf_urls_without_suffix(monkeypatch, tmp_path):
+    head = mock.MagicMock()
+    head.return_value.ok = True
+    head.return_value.headers = {"Content-Type": "application/pdf"}
+    get = mock.MagicMock()
+    response = get.return_value.__enter__.return_value
+    response.ok = True
+    response.headers = {"Content-Type": "application/pdf"}
+    response.iter_content.return_value = [b"%PDF-1.4"]
+    monkeypatch.setattr(webpage.requests, "head", head)
+    monkeypatch.setattr(webpage.requests, "get", get)
+
+    output_path = tmp_path / "a.pdf"
+    metadata = webpage.download_pdf("https://arxiv.org/pdf/1234.5678", str(output_path))
+
+    assert output_path.read_bytes() == b"%PDF-1.4"
+    assert metadata["title"] == "1234.5678"
+    assert metadata["domain"] == "arxiv.org"
+
+
+def test_download_pdf_probes_pdf_urls_with_short_connect_timeout(monkeypatch, tmp_path):
+    head = mock.MagicMock()
+    get = mock.MagicMock()
+    get.return_value.__enter__.return_value.ok = False
+    monkeypatch.setattr(webpage.requests, "head", head)
+    monkeypatch.setattr(webpage.requests, "get", get)
+
+    output_path = str(tmp_path / "a.pdf")
+    assert webpage.download_pdf("https://example.com/paper.PDF", output_path) is None
+    head.assert_not_called()
+    get.assert_called_once()
+    assert get.call_args.kwargs["timeout"] == (3, 30)